@@ -1,4 +1,5 @@
 from django.contrib import admin
+from django.db import transaction
 from .models import (
     User,
     Teacher,
@@ -14,46 +15,69 @@ from .models import (
 # -------------------------------------------------
 @admin.action(description="Promote selected students to next semester")
 def promote_students(modeladmin, request, queryset):
-    success_count = 0
-
-    for student in queryset:
+    with transaction.atomic():
+        # Lock the selected rows so concurrent promotions cannot overlap
+        students = list(
+            queryset.select_for_update().select_related('division')
+        )
 
-        # Max semester check
-        if student.semester >= 4:
-            modeladmin.message_user(
-                request,
-                f"Student {student.roll_number} is already in Semester 4.",
-                level="error"
+        # Load every candidate next semester division in a single query,
+        # keyed by (course, semester, division letter)
+        keys = {
+            (s.course, s.semester + 1, s.division.division)
+            for s in students
+            if s.semester < 4
+        }
+        next_divisions = {}
+        if keys:
+            next_divisions = {
+                (d.course, d.semester, d.division): d
+                for d in Division.objects.filter(
+                    course__in={k[0] for k in keys},
+                    semester__in={k[1] for k in keys},
+                    division__in={k[2] for k in keys},
+                )
+            }
+
+        promoted = []
+        errors = []
+
+        for student in students:
+
+            # Max semester check
+            if student.semester >= 4:
+                errors.append(
+                    f"Student {student.roll_number} is already in Semester 4."
+                )
+                continue
+
+            next_semester = student.semester + 1
+
+            # Find next semester division (same course & division letter)
+            next_division = next_divisions.get(
+                (student.course, next_semester, student.division.division)
             )
-            continue
+            if next_division is None:
+                errors.append(
+                    f"Division {student.division.division} for Semester {next_semester} does not exist."
+                )
+                continue
 
-        next_semester = student.semester + 1
+            # Promote student
+            student.semester = next_semester
+            student.division = next_division
+            promoted.append(student)
 
-        # Find next semester division (same course & division letter)
-        try:
-            next_division = Division.objects.get(
-                course=student.course,
-                semester=next_semester,
-                division=student.division.division
-            )
-        except Division.DoesNotExist:
-            modeladmin.message_user(
-                request,
-                f"Division {student.division.division} for Semester {next_semester} does not exist.",
-                level="error"
-            )
-            continue
+        Student.objects.bulk_update(promoted, ['semester', 'division'], batch_size=500)
 
-        # Promote student
-        student.semester = next_semester
-        student.division = next_division
-        student.save()
-        success_count += 1
+    # One message per outcome rather than one per student
+    if errors:
+        modeladmin.message_user(request, " ".join(errors), level="error")
 
-    if success_count:
+    if promoted:
         modeladmin.message_user(
             request,
-            f"{success_count} student(s) promoted successfully."
+            f"{len(promoted)} student(s) promoted successfully."
         )
 
 
@@ -78,6 +102,7 @@ class TeacherAdmin(admin.ModelAdmin):
         'hod_course',
     )
     list_filter = ('is_batch_coordinator', 'is_hod', 'department')
+    list_select_related = ('user',)
     search_fields = ('user__username',)
 
 
@@ -91,6 +116,7 @@ class DivisionAdmin(admin.ModelAdmin):
 class StudentAdmin(admin.ModelAdmin):
     list_display = ('roll_number', 'course', 'semester', 'division')
     list_filter = ('course', 'semester', 'division')
+    list_select_related = ('user', 'division')
     search_fields = ('roll_number', 'user__username')
     actions = [promote_students]
 
@@ -106,3 +132,4 @@ class SubjectAdmin(admin.ModelAdmin):
 class SubjectAssignmentAdmin(admin.ModelAdmin):
     list_display = ('subject', 'division', 'teacher')
     list_filter = ('division', 'teacher')
+    list_select_related = ('subject', 'division', 'teacher__user')
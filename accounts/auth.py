@@ -0,0 +1,94 @@
+import time
+from functools import lru_cache
+
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.utils import get_md5_hash_password
+
+
+# -------------------------------------------------
+# Role Context (computed once per request)
+# -------------------------------------------------
+def set_role_context(request, user):
+    teacher = (
+        getattr(user, 'teacher_profile', None)
+        if user.role == 'teacher' else None
+    )
+
+    request.is_coordinator = bool(teacher and teacher.is_batch_coordinator)
+    request.is_hod = bool(teacher and teacher.is_hod)
+    request.coordinator_triplet = (
+        (
+            teacher.coordinator_course,
+            teacher.coordinator_semester,
+            teacher.coordinator_division,
+        )
+        if request.is_coordinator else None
+    )
+    request.hod_course = teacher.hod_course if request.is_hod else None
+
+
+# -------------------------------------------------
+# Validated Tokens (signature checked once per token)
+# -------------------------------------------------
+@lru_cache(maxsize=4096)
+def cached_validated_token(raw_token):
+    # Invalid tokens raise, and exceptions are never cached
+    return JWTAuthentication().get_validated_token(raw_token)
+
+
+# -------------------------------------------------
+# JWT Authentication (profiles joined on the user)
+# -------------------------------------------------
+class ProfileJWTAuthentication(JWTAuthentication):
+
+    # Role checks read these on almost every request
+    user_related = ('teacher_profile', 'student_profile__division')
+
+    def authenticate(self, request):
+        result = super().authenticate(request)
+        if result is not None:
+            set_role_context(request, result[0])
+        return result
+
+    def get_validated_token(self, raw_token):
+        validated_token = cached_validated_token(raw_token)
+
+        # A cached token is only good until its own expiry
+        if validated_token.get('exp', 0) <= time.time():
+            return super().get_validated_token(raw_token)
+
+        return validated_token
+
+    def get_user(self, validated_token):
+        # Same checks as JWTAuthentication.get_user, one joined query
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError as e:
+            raise InvalidToken(
+                _("Token contained no recognizable user identification")
+            ) from e
+
+        try:
+            user = self.user_model.objects.select_related(
+                *self.user_related
+            ).get(**{api_settings.USER_ID_FIELD: user_id})
+        except self.user_model.DoesNotExist as e:
+            raise AuthenticationFailed(
+                _("User not found"), code="user_not_found"
+            ) from e
+
+        if api_settings.CHECK_USER_IS_ACTIVE and not user.is_active:
+            raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
+
+        if api_settings.CHECK_REVOKE_TOKEN:
+            if validated_token.get(
+                api_settings.REVOKE_TOKEN_CLAIM
+            ) != get_md5_hash_password(user.password):
+                raise AuthenticationFailed(
+                    _("The user's password has been changed."), code="password_changed"
+                )
+
+        return user
@@ -0,0 +1,44 @@
+import time
+
+from django.core.cache import cache, caches
+from django.core.cache.backends.locmem import LocMemCache
+
+
+# -------------------------------------------------
+# Room Bookings (/api/room-booking-log/)
+# -------------------------------------------------
+BOOKING_VERSION_KEY = "rb:ver"
+BOOKING_LOG_TIMEOUT = 300
+
+
+def seed_booking_version():
+    # Seeded from the clock, so a flushed or evicted counter never comes
+    # back as a version an old ETag or cached log was built from
+    cache.add(BOOKING_VERSION_KEY, time.time_ns(), timeout=None)
+
+
+def booking_version():
+    # Workers only agree on the version through a shared cache, a
+    # per-process LocMem counter could keep serving stale data forever
+    if isinstance(caches['default'], LocMemCache):
+        return None
+
+    version = cache.get(BOOKING_VERSION_KEY)
+    if version is None:
+        seed_booking_version()
+        version = cache.get(BOOKING_VERSION_KEY)
+    return version
+
+
+def booking_log_key():
+    version = booking_version()
+    return None if version is None else f"rb:log:v{version}"
+
+
+def invalidate_bookings():
+    # Bumping the version orphans every cached copy at once
+    seed_booking_version()
+    try:
+        cache.incr(BOOKING_VERSION_KEY)
+    except ValueError:
+        cache.set(BOOKING_VERSION_KEY, time.time_ns(), timeout=None)
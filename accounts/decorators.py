@@ -0,0 +1,34 @@
+from functools import wraps
+
+from rest_framework.response import Response
+
+
+# -------------------------------------------------
+# Role gates (apply below @api_view)
+# -------------------------------------------------
+def admin_required(view):
+    @wraps(view)
+    def wrapped(request, *args, **kwargs):
+        if request.user.role != 'admin':
+            return Response({"error": "Only admin allowed"}, status=403)
+        return view(request, *args, **kwargs)
+    return wrapped
+
+
+def require_coordinator(view):
+    @wraps(view)
+    def wrapped(request, *args, **kwargs):
+        # is_coordinator is set by ProfileJWTAuthentication
+        if not request.is_coordinator:
+            return Response({"error": "Unauthorized"}, status=403)
+        return view(request, *args, **kwargs)
+    return wrapped
+
+
+def require_hod(view):
+    @wraps(view)
+    def wrapped(request, *args, **kwargs):
+        if not request.is_hod:
+            return Response({"error": "Only HOD allowed"}, status=403)
+        return view(request, *args, **kwargs)
+    return wrapped
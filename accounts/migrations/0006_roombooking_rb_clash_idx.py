@@ -0,0 +1,17 @@
+# Generated by Django 6.0.2 on 2026-10-14 17:42
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0005_studentleave'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='roombooking',
+            index=models.Index(condition=models.Q(('status', 'APPROVED')), fields=['room', 'booking_date', 'start_time'], name='rb_clash_idx'),
+        ),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 6.0.2 on 2026-10-14 17:42
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0006_roombooking_rb_clash_idx'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='teacher',
+            index=models.Index(condition=models.Q(('is_batch_coordinator', True)), fields=['is_batch_coordinator', 'coordinator_course', 'coordinator_semester', 'coordinator_division'], name='tc_coord_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='teacher',
+            index=models.Index(condition=models.Q(('is_hod', True)), fields=['is_hod', 'hod_course'], name='tc_hod_idx'),
+        ),
+    ]
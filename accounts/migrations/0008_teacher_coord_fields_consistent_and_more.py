@@ -0,0 +1,21 @@
+# Generated by Django 6.0.2 on 2026-10-14 17:45
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0007_teacher_tc_coord_idx_teacher_tc_hod_idx'),
+    ]
+
+    operations = [
+        migrations.AddConstraint(
+            model_name='teacher',
+            constraint=models.CheckConstraint(condition=models.Q(models.Q(('coordinator_course__isnull', False), ('coordinator_division__isnull', False), ('coordinator_semester__isnull', False), ('is_batch_coordinator', True), models.Q(('coordinator_course', ''), _negated=True), models.Q(('coordinator_division', ''), _negated=True)), models.Q(('coordinator_semester__isnull', True), ('is_batch_coordinator', False), models.Q(('coordinator_course__isnull', True), ('coordinator_course', ''), _connector='OR'), models.Q(('coordinator_division__isnull', True), ('coordinator_division', ''), _connector='OR')), _connector='OR'), name='coord_fields_consistent', violation_error_message='Batch Coordinator needs course, semester and division; other teachers must leave them empty.'),
+        ),
+        migrations.AddConstraint(
+            model_name='teacher',
+            constraint=models.CheckConstraint(condition=models.Q(models.Q(('hod_course__isnull', False), ('is_hod', True), models.Q(('hod_course', ''), _negated=True)), models.Q(('is_hod', False), models.Q(('hod_course__isnull', True), ('hod_course', ''), _connector='OR')), _connector='OR'), name='hod_fields_consistent', violation_error_message='HOD needs a course; other teachers must leave it empty.'),
+        ),
+    ]
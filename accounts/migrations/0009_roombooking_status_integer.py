@@ -0,0 +1,56 @@
+# Generated by Django 6.0.2 on 2026-10-14 17:48
+
+from django.db import migrations, models
+
+
+STATUS_CODES = {
+    'PENDING_COORDINATOR': 1,
+    'PENDING_HOD': 2,
+    'APPROVED': 3,
+    'REJECTED': 4,
+}
+
+
+def status_to_code(apps, schema_editor):
+    RoomBooking = apps.get_model('accounts', 'RoomBooking')
+    for name, code in STATUS_CODES.items():
+        RoomBooking.objects.filter(status=name).update(status_code=code)
+
+
+def code_to_status(apps, schema_editor):
+    RoomBooking = apps.get_model('accounts', 'RoomBooking')
+    for name, code in STATUS_CODES.items():
+        RoomBooking.objects.filter(status_code=code).update(status=name)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0008_teacher_coord_fields_consistent_and_more'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='roombooking',
+            name='rb_clash_idx',
+        ),
+        migrations.AddField(
+            model_name='roombooking',
+            name='status_code',
+            field=models.PositiveSmallIntegerField(choices=[(1, 'Pending Batch Coordinator'), (2, 'Pending HOD'), (3, 'Approved'), (4, 'Rejected')], default=1),
+        ),
+        migrations.RunPython(status_to_code, code_to_status),
+        migrations.RemoveField(
+            model_name='roombooking',
+            name='status',
+        ),
+        migrations.RenameField(
+            model_name='roombooking',
+            old_name='status_code',
+            new_name='status',
+        ),
+        migrations.AddIndex(
+            model_name='roombooking',
+            index=models.Index(condition=models.Q(('status', 3)), fields=['room', 'booking_date', 'start_time'], name='rb_clash_idx'),
+        ),
+    ]
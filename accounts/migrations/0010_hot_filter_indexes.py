@@ -0,0 +1,37 @@
+# Generated by Django 6.0.2 on 2026-10-14 17:54
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0009_roombooking_status_integer'),
+    ]
+
+    operations = [
+        migrations.AlterUniqueTogether(
+            name='division',
+            unique_together=set(),
+        ),
+        migrations.AddIndex(
+            model_name='roombooking',
+            index=models.Index(fields=['status', 'booking_date', 'start_time'], name='rb_status_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='roombooking',
+            index=models.Index(fields=['division', 'status'], name='rb_div_status_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='studentleave',
+            index=models.Index(fields=['status', 'decision_at'], name='sl_status_decision_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='studentleave',
+            index=models.Index(fields=['division', 'status'], name='sl_div_status_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='division',
+            constraint=models.UniqueConstraint(fields=('course', 'semester', 'division'), name='division_unique'),
+        ),
+    ]
@@ -80,6 +80,75 @@ class Teacher(models.Model):
         max_length=10, choices=COURSE_CHOICES, null=True, blank=True
     )
 
+    class Meta:
+        indexes = [
+            # Role lookups only ever look for the flagged teachers
+            models.Index(
+                fields=[
+                    'is_batch_coordinator',
+                    'coordinator_course',
+                    'coordinator_semester',
+                    'coordinator_division',
+                ],
+                name='tc_coord_idx',
+                condition=models.Q(is_batch_coordinator=True),
+            ),
+            models.Index(
+                fields=['is_hod', 'hod_course'],
+                name='tc_hod_idx',
+                condition=models.Q(is_hod=True),
+            ),
+        ]
+        # Same rules as clean(), enforced by the database as well
+        constraints = [
+            models.CheckConstraint(
+                name='coord_fields_consistent',
+                condition=(
+                    models.Q(
+                        is_batch_coordinator=True,
+                        coordinator_course__isnull=False,
+                        coordinator_semester__isnull=False,
+                        coordinator_division__isnull=False,
+                    )
+                    & ~models.Q(coordinator_course='')
+                    & ~models.Q(coordinator_division='')
+                ) | (
+                    models.Q(
+                        is_batch_coordinator=False,
+                        coordinator_semester__isnull=True,
+                    )
+                    & (
+                        models.Q(coordinator_course__isnull=True)
+                        | models.Q(coordinator_course='')
+                    )
+                    & (
+                        models.Q(coordinator_division__isnull=True)
+                        | models.Q(coordinator_division='')
+                    )
+                ),
+                violation_error_message=(
+                    "Batch Coordinator needs course, semester and division; "
+                    "other teachers must leave them empty."
+                ),
+            ),
+            models.CheckConstraint(
+                name='hod_fields_consistent',
+                condition=(
+                    models.Q(is_hod=True, hod_course__isnull=False)
+                    & ~models.Q(hod_course='')
+                ) | (
+                    models.Q(is_hod=False)
+                    & (
+                        models.Q(hod_course__isnull=True)
+                        | models.Q(hod_course='')
+                    )
+                ),
+                violation_error_message=(
+                    "HOD needs a course; other teachers must leave it empty."
+                ),
+            ),
+        ]
+
     def clean(self):
         # Batch coordinator rules
         if self.is_batch_coordinator:
@@ -133,7 +202,13 @@ class Division(models.Model):
     division = models.CharField(max_length=1, choices=DIVISION_CHOICES)
 
     class Meta:
-        unique_together = ('course', 'semester', 'division')
+        # Also the index behind every course/semester/division lookup
+        constraints = [
+            models.UniqueConstraint(
+                fields=['course', 'semester', 'division'],
+                name='division_unique',
+            ),
+        ]
 
     def __str__(self):
         return f"{self.course} - Sem {self.semester} - {self.division}"
@@ -267,14 +342,16 @@ class Room(models.Model):
 # -------------------------------------------------
 # Room Booking Model
 # -------------------------------------------------
+class BookingStatus(models.IntegerChoices):
+    PENDING_COORDINATOR = 1, 'Pending Batch Coordinator'
+    PENDING_HOD = 2, 'Pending HOD'
+    APPROVED = 3, 'Approved'
+    REJECTED = 4, 'Rejected'
+
+
 class RoomBooking(models.Model):
 
-    STATUS_CHOICES = (
-        ('PENDING_COORDINATOR', 'Pending Batch Coordinator'),
-        ('PENDING_HOD', 'Pending HOD'),
-        ('APPROVED', 'Approved'),
-        ('REJECTED', 'Rejected'),
-    )
+    Status = BookingStatus
 
     room = models.ForeignKey(Room, on_delete=models.PROTECT)
 
@@ -297,10 +374,9 @@ class RoomBooking(models.Model):
     start_time = models.TimeField()
     end_time = models.TimeField()
 
-    status = models.CharField(
-        max_length=30,
-        choices=STATUS_CHOICES,
-        default='PENDING_COORDINATOR'
+    status = models.PositiveSmallIntegerField(
+        choices=Status.choices,
+        default=Status.PENDING_COORDINATOR
     )
 
     coordinator_approved = models.BooleanField(default=False)
@@ -308,8 +384,28 @@ class RoomBooking(models.Model):
 
     created_at = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        indexes = [
+            # Clash check only ever looks at approved bookings
+            models.Index(
+                fields=['room', 'booking_date', 'start_time'],
+                name='rb_clash_idx',
+                condition=models.Q(status=BookingStatus.APPROVED),
+            ),
+            # Booking log: filter on status, ordered by date and time
+            models.Index(
+                fields=['status', 'booking_date', 'start_time'],
+                name='rb_status_date_idx',
+            ),
+            # Coordinator queue: pending bookings of one division
+            models.Index(
+                fields=['division', 'status'],
+                name='rb_div_status_idx',
+            ),
+        ]
+
     def __str__(self):
-        return f"{self.room} | {self.booking_date} | {self.status}"
+        return f"{self.room} | {self.booking_date} | {self.Status(self.status).name}"
 # -------------------------------------------------
 # Student Leave Model
 # -------------------------------------------------
@@ -357,6 +453,20 @@ class StudentLeave(models.Model):
     applied_at = models.DateTimeField(auto_now_add=True)
     decision_at = models.DateTimeField(null=True, blank=True)
 
+    class Meta:
+        indexes = [
+            # Leave log: approved leaves, latest decision first
+            models.Index(
+                fields=['status', 'decision_at'],
+                name='sl_status_decision_idx',
+            ),
+            # Coordinator queue: pending leaves of one division
+            models.Index(
+                fields=['division', 'status'],
+                name='sl_div_status_idx',
+            ),
+        ]
+
     def clean(self):
         if self.to_date < self.from_date:
             raise ValidationError("To date cannot be before From date.")
@@ -0,0 +1,26 @@
+from rest_framework.pagination import PageNumberPagination
+from rest_framework.utils.urls import replace_query_param
+
+
+# -------------------------------------------------
+# Opt-in Page Number Pagination
+# -------------------------------------------------
+# Lists are paginated only when the client sends ?page=,
+# plain requests keep receiving the full JSON list.
+class OptionalPageNumberPagination(PageNumberPagination):
+    page_size_query_param = 'page_size'
+    max_page_size = 500
+
+    def get_page_size(self, request):
+        if self.page_query_param not in request.query_params:
+            return None
+        return super().get_page_size(request)
+
+    def get_previous_link(self):
+        # Keep ?page=1 explicit, without it the link would return the full list
+        if not self.page.has_previous():
+            return None
+        url = self.request.build_absolute_uri()
+        return replace_query_param(
+            url, self.page_query_param, self.page.previous_page_number()
+        )
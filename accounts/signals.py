@@ -0,0 +1,34 @@
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from .cache import invalidate_bookings
+from .models import User, Division, Room, RoomBooking
+
+
+# -------------------------------------------------
+# Room Booking cache invalidation
+# -------------------------------------------------
+@receiver([post_save, post_delete], sender=RoomBooking)
+def booking_changed(sender, instance, **kwargs):
+    invalidate_bookings()
+
+
+# Booking lists also show room, division and user data
+# (a newly created row is not in any booking yet)
+BOOKING_USER_FIELDS = {'username', 'role'}
+
+
+@receiver(post_save, sender=Room)
+@receiver(post_save, sender=Division)
+def booking_related_changed(sender, instance, created, **kwargs):
+    if not created:
+        invalidate_bookings()
+
+
+@receiver(post_save, sender=User)
+def booking_user_changed(sender, instance, created, update_fields=None, **kwargs):
+    # Logins only touch last_login / password, which no list shows
+    if created:
+        return
+    if update_fields is None or BOOKING_USER_FIELDS & set(update_fields):
+        invalidate_bookings()
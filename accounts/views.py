@@ -1,3 +1,5 @@
+import orjson
+
 from rest_framework.decorators import (
     api_view,
     permission_classes,
@@ -6,12 +8,17 @@ from rest_framework.decorators import (
 )
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
-from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework.settings import api_settings
 from rest_framework.parsers import MultiPartParser, FormParser
 
 from django.contrib.auth.hashers import make_password
+from django.core.cache import cache
 from django.core.exceptions import ValidationError
-from django.db import IntegrityError
+from django.http import HttpResponse, StreamingHttpResponse
+from django.views.decorators.http import etag
+from django.db import IntegrityError, transaction
+from django.db.models import CharField, Case, Exists, OuterRef, Q, Value, When
+from django.db.models.functions import Cast, Concat
 
 from .models import (
     User,
@@ -21,30 +28,128 @@ from .models import (
     Room,
     RoomBooking,
 )
+from .auth import ProfileJWTAuthentication
+from .cache import (
+    booking_log_key,
+    booking_version,
+    invalidate_bookings,
+    BOOKING_LOG_TIMEOUT,
+)
+from .decorators import admin_required, require_coordinator, require_hod
+
+ROOM_TYPE_DISPLAY = dict(Room.ROOM_TYPE_CHOICES)
+BOOKING_STATUS_NAMES = {
+    status.value: status.name.replace("_", " ")
+    for status in RoomBooking.Status
+}
+
+# "MCA - Sem 1 - A", built by the database ("N/A" without a division)
+DIVISION_LABEL = Case(
+    When(division__isnull=True, then=Value("N/A")),
+    default=Concat(
+        "division__course",
+        Value(" - Sem "),
+        Cast("division__semester", output_field=CharField()),
+        Value(" - "),
+        "division__division",
+        output_field=CharField(),
+    ),
+    output_field=CharField(),
+)
+
+# "10:00:00 - 11:00:00", same text str(time) gave
+TIME_LABEL = Concat(
+    Cast("start_time", output_field=CharField()),
+    Value(" - "),
+    Cast("end_time", output_field=CharField()),
+    output_field=CharField(),
+)
+
+# Unique constraint name (PostgreSQL) -> field it guards
+UNIQUE_CONSTRAINT_FIELDS = {
+    'accounts_user_username_key': 'username',
+    'accounts_student_roll_number_key': 'roll_number',
+    'accounts_room_room_number_key': 'room_number',
+}
+
+
+def violated_field(error):
+    # psycopg exposes the violated constraint name directly
+    diag = getattr(error.__cause__, 'diag', None)
+    constraint = getattr(diag, 'constraint_name', None)
+    if constraint:
+        return UNIQUE_CONSTRAINT_FIELDS.get(constraint)
+
+    # SQLite only reports "UNIQUE constraint failed: <table>.<column>"
+    message = error.args[0] if error.args else ''
+    _, found, columns = str(message).partition('constraint failed: ')
+    return columns.rsplit('.', 1)[-1] if found else None
+
+
+def list_response(request, queryset, row):
+    # ?page= / ?page_size= return one page, otherwise the full list
+    paginator = api_settings.DEFAULT_PAGINATION_CLASS()
+    page = paginator.paginate_queryset(queryset, request)
+
+    if page is None:
+        # Stream rows from the cursor instead of caching the whole queryset
+        return json_response([row(obj) for obj in queryset.iterator(chunk_size=2000)])
+
+    return paginator.get_paginated_response([row(obj) for obj in page])
+
+
+def json_response(data):
+    # Rows are plain dicts already, encode them without DRF's renderer
+    return HttpResponse(
+        orjson.dumps(data, default=str, option=orjson.OPT_UTC_Z),
+        content_type="application/json",
+    )
+
+
+def booking_etag(request, *args, **kwargs):
+    # Any booking change bumps the version, the user part keeps
+    # per-user lists apart in shared browser caches
+    version = booking_version()
+    if version is None:
+        return None
+    return f"rb{version}-u{request.user.id}"
+
+
+def stream_json_list(rows, batch_size=1000):
+    # Encode a JSON array piece by piece, one chunk per batch of rows
+    yield b"["
+    batch = []
+    separator = b""
+    for r in rows:
+        batch.append(orjson.dumps(r))
+        if len(batch) == batch_size:
+            yield separator + b",".join(batch)
+            separator = b","
+            batch = []
+    if batch:
+        yield separator + b",".join(batch)
+    yield b"]"
+
 
 # =================================================
 # AUTH / USER
 # =================================================
 
 @api_view(['GET'])
-@authentication_classes([JWTAuthentication])
+@authentication_classes([ProfileJWTAuthentication])
 @permission_classes([IsAuthenticated])
 def current_user(request):
+    # Everything here was loaded by ProfileJWTAuthentication already
     response_data = {
         "username": request.user.username,
         "role": request.user.role
     }
-    
+
     # Add teacher-specific fields if user is a teacher
     if request.user.role == 'teacher':
-        try:
-            teacher = request.user.teacher_profile
-            response_data["is_batch_coordinator"] = teacher.is_batch_coordinator
-            response_data["is_hod"] = teacher.is_hod
-        except:
-            response_data["is_batch_coordinator"] = False
-            response_data["is_hod"] = False
-    
+        response_data["is_batch_coordinator"] = request.is_coordinator
+        response_data["is_hod"] = request.is_hod
+
     return Response(response_data)
 
 
@@ -53,51 +158,48 @@ def current_user(request):
 # =================================================
 
 @api_view(['POST'])
-@authentication_classes([JWTAuthentication])
+@authentication_classes([ProfileJWTAuthentication])
 @permission_classes([IsAuthenticated])
+@admin_required
 def register_teacher(request):
 
-    if request.user.role != 'admin':
-        return Response({"error": "Only admin allowed"}, status=403)
-
     data = request.data
 
     try:
-        # Check if username already exists
-        if User.objects.filter(username=data["username"]).exists():
-            return Response({"error": f"Username '{data['username']}' is already taken. Please choose a different username."}, status=400)
-
-        user = User.objects.create(
-            username=data["username"],
-            password=make_password(data["password"]),
-            role="teacher"
-        )
+        # Duplicates are caught by the unique constraints below
+        with transaction.atomic():
+            user = User.objects.create(
+                username=data["username"],
+                password=make_password(data["password"]),
+                role="teacher"
+            )
 
-        teacher = Teacher(
-            user=user,
-            qualification=data["qualification"],
-            department=data["department"],
-            position=data["position"],
-            experience_years=data["experience_years"],
-            phone=data["phone"],
-            date_of_joining=data["date_of_joining"],
-
-            is_hod=bool(data.get("is_hod")),
-            hod_course=data.get("hod_course"),
-
-            is_batch_coordinator=bool(data.get("is_batch_coordinator")),
-            coordinator_course=data.get("coordinator_course"),
-            coordinator_semester=data.get("coordinator_semester"),
-            coordinator_division=data.get("coordinator_division"),
-        )
+            teacher = Teacher(
+                user=user,
+                qualification=data["qualification"],
+                department=data["department"],
+                position=data["position"],
+                experience_years=data["experience_years"],
+                phone=data["phone"],
+                date_of_joining=data["date_of_joining"],
+
+                is_hod=bool(data.get("is_hod")),
+                hod_course=data.get("hod_course"),
+
+                is_batch_coordinator=bool(data.get("is_batch_coordinator")),
+                coordinator_course=data.get("coordinator_course"),
+                coordinator_semester=data.get("coordinator_semester"),
+                coordinator_division=data.get("coordinator_division"),
+            )
 
-        teacher.full_clean()
-        teacher.save()
+            # clean() mirrors the check constraints, the DB enforces both
+            teacher.full_clean(validate_unique=False, validate_constraints=False)
+            teacher.save()
 
         return Response({"message": "Teacher registered"}, status=201)
 
     except IntegrityError as e:
-        if 'username' in str(e):
+        if violated_field(e) == 'username':
             return Response({"error": f"Username '{data['username']}' is already taken. Please choose a different username."}, status=400)
         else:
             return Response({"error": f"Database error: {str(e)}"}, status=400)
@@ -112,58 +214,51 @@ def register_teacher(request):
 # =================================================
 
 @api_view(['POST'])
-@authentication_classes([JWTAuthentication])
+@authentication_classes([ProfileJWTAuthentication])
 @permission_classes([IsAuthenticated])
+@admin_required
 def register_student(request):
 
-    if request.user.role != 'admin':
-        return Response({"error": "Only admin allowed"}, status=403)
-
     data = request.data
 
     try:
-        # Check if username already exists
-        if User.objects.filter(username=data["username"]).exists():
-            return Response({"error": f"Username '{data['username']}' is already taken. Please choose a different username."}, status=400)
-
-        # Check if roll number already exists
-        if Student.objects.filter(roll_number=data["roll_number"]).exists():
-            return Response({"error": f"Roll number '{data['roll_number']}' already exists. Please use a unique roll number."}, status=400)
-
-        division, _ = Division.objects.get_or_create(
-            course=data["course"],
-            semester=1,
-            division=data["division"]
-        )
+        # Duplicates are caught by the unique constraints below
+        with transaction.atomic():
+            division, _ = Division.objects.get_or_create(
+                course=data["course"],
+                semester=1,
+                division=data["division"]
+            )
 
-        user = User.objects.create(
-            username=data["username"],
-            password=make_password(data["password"]),
-            role="student"
-        )
+            user = User.objects.create(
+                username=data["username"],
+                password=make_password(data["password"]),
+                role="student"
+            )
 
-        student = Student(
-            user=user,
-            roll_number=data["roll_number"],
-            course=data["course"],
-            division=division,
-            admission_year=data["admission_year"],
-            phone=data["phone"],
-            address=data["address"],
-            guardian_name=data["guardian_name"],
-            guardian_phone=data["guardian_phone"],
-        )
+            student = Student(
+                user=user,
+                roll_number=data["roll_number"],
+                course=data["course"],
+                division=division,
+                admission_year=data["admission_year"],
+                phone=data["phone"],
+                address=data["address"],
+                guardian_name=data["guardian_name"],
+                guardian_phone=data["guardian_phone"],
+            )
 
-        student.full_clean()
-        student.save()
+            student.full_clean(validate_unique=False)
+            student.save()
 
         return Response({"message": "Student enrolled successfully"}, status=201)
 
     except IntegrityError as e:
-        if 'username' in str(e):
+        field = violated_field(e)
+        if field == 'username':
             return Response({"error": f"Username '{data['username']}' is already taken. Please choose a different username."}, status=400)
-        elif 'roll_number' in str(e):
-            return Response({"error": f"Roll number '{data['roll_number']}' already exists."}, status=400)
+        elif field == 'roll_number':
+            return Response({"error": f"Roll number '{data['roll_number']}' already exists. Please use a unique roll number."}, status=400)
         else:
             return Response({"error": f"Database error: {str(e)}"}, status=400)
     except ValidationError as e:
@@ -177,19 +272,14 @@ def register_student(request):
 # =================================================
 
 @api_view(['POST'])
-@authentication_classes([JWTAuthentication])
+@authentication_classes([ProfileJWTAuthentication])
 @permission_classes([IsAuthenticated])
 @parser_classes([MultiPartParser, FormParser])
+@admin_required
 def create_room(request):
 
-    if request.user.role != 'admin':
-        return Response({"error": "Only admin allowed"}, status=403)
-
     try:
-        # Check if room number already exists
-        if Room.objects.filter(room_number=request.data["room_number"]).exists():
-            return Response({"error": f"Room number '{request.data['room_number']}' already exists. Please use a unique room number."}, status=400)
-
+        # Duplicate room numbers are caught by the unique constraint below
         room = Room(
             room_number=request.data["room_number"],
             capacity=int(request.data["capacity"]),
@@ -197,13 +287,17 @@ def create_room(request):
             image=request.FILES.get("image"),
         )
 
-        room.full_clean()
+        room.full_clean(validate_unique=False)
         room.save()
 
         return Response({"message": "Room created successfully"}, status=201)
 
     except IntegrityError as e:
-        if 'room_number' in str(e):
+        # The image was stored by pre_save before the INSERT failed
+        if room.image:
+            room.image.delete(save=False)
+
+        if violated_field(e) == 'room_number':
             return Response({"error": f"Room number '{request.data['room_number']}' already exists. Please use a unique room number."}, status=400)
         else:
             return Response({"error": f"Database error: {str(e)}"}, status=400)
@@ -214,19 +308,27 @@ def create_room(request):
 
 
 @api_view(['GET'])
-@authentication_classes([JWTAuthentication])
+@authentication_classes([ProfileJWTAuthentication])
 @permission_classes([IsAuthenticated])
 def list_teachers(request):
-    teachers = Teacher.objects.all()
+    teachers = Teacher.objects.values(
+        'id',
+        'user__username',
+        'qualification',
+        'department',
+        'position',
+        'experience_years',
+        'phone',
+    )
     data = [
         {
-            "id": teacher.id,
-            "username": teacher.user.username,
-            "qualification": teacher.qualification,
-            "department": teacher.department,
-            "position": teacher.position,
-            "experience_years": teacher.experience_years,
-            "phone": teacher.phone,
+            "id": teacher["id"],
+            "username": teacher["user__username"],
+            "qualification": teacher["qualification"],
+            "department": teacher["department"],
+            "position": teacher["position"],
+            "experience_years": teacher["experience_years"],
+            "phone": teacher["phone"],
         }
         for teacher in teachers
     ]
@@ -234,49 +336,57 @@ def list_teachers(request):
 
 
 @api_view(['PUT', 'DELETE'])
-@authentication_classes([JWTAuthentication])
+@authentication_classes([ProfileJWTAuthentication])
 @permission_classes([IsAuthenticated])
+@admin_required
 def manage_teacher(request, teacher_id):
-    if request.user.role != 'admin':
-        return Response({"error": "Only admin allowed"}, status=403)
-
-    try:
-        teacher = Teacher.objects.get(id=teacher_id)
-    except Teacher.DoesNotExist:
-        return Response({"error": "Teacher not found"}, status=404)
-
     if request.method == 'PUT':
-        # Update teacher
-        teacher.qualification = request.data.get("qualification", teacher.qualification)
-        teacher.department = request.data.get("department", teacher.department)
-        teacher.position = request.data.get("position", teacher.position)
-        teacher.experience_years = request.data.get("experience_years", teacher.experience_years)
-        teacher.phone = request.data.get("phone", teacher.phone)
-        teacher.save()
+        # Update only the supplied columns in a single UPDATE
+        fields = {
+            k: request.data[k]
+            for k in ("qualification", "department", "position", "experience_years", "phone")
+            if k in request.data
+        }
+        teachers = Teacher.objects.filter(id=teacher_id)
+        updated = teachers.update(**fields) if fields else teachers.exists()
+
+        if not updated:
+            return Response({"error": "Teacher not found"}, status=404)
         return Response({"message": "Teacher updated successfully"}, status=200)
 
     elif request.method == 'DELETE':
-        # Delete teacher and associated user
-        user = teacher.user
-        teacher.delete()
-        user.delete()
+        try:
+            teacher = Teacher.objects.select_related('user').get(id=teacher_id)
+        except Teacher.DoesNotExist:
+            return Response({"error": "Teacher not found"}, status=404)
+
+        # Deleting the user cascades to the teacher profile
+        teacher.user.delete()
         return Response({"message": "Teacher deleted successfully"}, status=200)
 
 
 @api_view(['GET'])
-@authentication_classes([JWTAuthentication])
+@authentication_classes([ProfileJWTAuthentication])
 @permission_classes([IsAuthenticated])
 def list_students(request):
-    students = Student.objects.all()
+    students = Student.objects.values(
+        'id',
+        'user__username',
+        'roll_number',
+        'division__course',
+        'division__semester',
+        'phone',
+        'address',
+    )
     data = [
         {
-            "id": student.id,
-            "username": student.user.username,
-            "roll_number": student.roll_number,
-            "course": student.division.course,
-            "semester": student.division.semester,
-            "phone": student.phone,
-            "address": student.address,
+            "id": student["id"],
+            "username": student["user__username"],
+            "roll_number": student["roll_number"],
+            "course": student["division__course"],
+            "semester": student["division__semester"],
+            "phone": student["phone"],
+            "address": student["address"],
         }
         for student in students
     ]
@@ -284,75 +394,86 @@ def list_students(request):
 
 
 @api_view(['PUT', 'DELETE'])
-@authentication_classes([JWTAuthentication])
+@authentication_classes([ProfileJWTAuthentication])
 @permission_classes([IsAuthenticated])
+@admin_required
 def manage_student(request, student_id):
-    if request.user.role != 'admin':
-        return Response({"error": "Only admin allowed"}, status=403)
-
-    try:
-        student = Student.objects.get(id=student_id)
-    except Student.DoesNotExist:
-        return Response({"error": "Student not found"}, status=404)
-
     if request.method == 'PUT':
-        # Update student
-        student.roll_number = request.data.get("roll_number", student.roll_number)
-        student.phone = request.data.get("phone", student.phone)
-        student.address = request.data.get("address", student.address)
-        student.save()
+        # Update only the supplied columns in a single UPDATE
+        fields = {
+            k: request.data[k]
+            for k in ("roll_number", "phone", "address")
+            if k in request.data
+        }
+        students = Student.objects.filter(id=student_id)
+        updated = students.update(**fields) if fields else students.exists()
+
+        if not updated:
+            return Response({"error": "Student not found"}, status=404)
         return Response({"message": "Student updated successfully"}, status=200)
 
     elif request.method == 'DELETE':
-        # Delete student and associated user
-        user = student.user
-        student.delete()
-        user.delete()
+        try:
+            student = Student.objects.select_related('user').get(id=student_id)
+        except Student.DoesNotExist:
+            return Response({"error": "Student not found"}, status=404)
+
+        # Deleting the user cascades to the student profile
+        student.user.delete()
         return Response({"message": "Student deleted successfully"}, status=200)
 
 
 @api_view(['GET'])
-@authentication_classes([JWTAuthentication])
+@authentication_classes([ProfileJWTAuthentication])
 @permission_classes([IsAuthenticated])
 def list_rooms(request):
 
-    rooms = Room.objects.all()
+    storage = Room._meta.get_field('image').storage
 
-    data = [
-        {
-            "id": room.id,
-            "room_number": room.room_number,
-            "room_type": room.room_type,
-            "capacity": room.capacity,
-            "image": room.image.url if room.image else None,  # ✅ REQUIRED
-        }
-        for room in rooms
-    ]
+    data = list(Room.objects.values(
+        'id',
+        'room_number',
+        'room_type',
+        'capacity',
+        'image',
+    ))
+
+    for room in data:
+        # ✅ REQUIRED: stored file name -> public URL
+        room["image"] = storage.url(room["image"]) if room["image"] else None
 
     return Response(data)
 
 
 @api_view(['PUT', 'DELETE'])
-@authentication_classes([JWTAuthentication])
+@authentication_classes([ProfileJWTAuthentication])
 @permission_classes([IsAuthenticated])
+@admin_required
 def manage_room(request, room_id):
-    if request.user.role != 'admin':
-        return Response({"error": "Only admin allowed"}, status=403)
+    if request.method == 'PUT':
+        # Update only the supplied columns in a single UPDATE
+        fields = {
+            k: request.data[k]
+            for k in ("room_number", "capacity", "room_type")
+            if k in request.data
+        }
+        rooms = Room.objects.filter(id=room_id)
+        updated = rooms.update(**fields) if fields else rooms.exists()
 
-    try:
-        room = Room.objects.get(id=room_id)
-    except Room.DoesNotExist:
-        return Response({"error": "Room not found"}, status=404)
+        if not updated:
+            return Response({"error": "Room not found"}, status=404)
 
-    if request.method == 'PUT':
-        # Update room
-        room.room_number = request.data.get("room_number", room.room_number)
-        room.capacity = request.data.get("capacity", room.capacity)
-        room.room_type = request.data.get("room_type", room.room_type)
-        room.save()
+        # update() skips the post_save signal, booking lists show rooms
+        if fields:
+            invalidate_bookings()
         return Response({"message": "Room updated successfully"}, status=200)
 
     elif request.method == 'DELETE':
+        try:
+            room = Room.objects.get(id=room_id)
+        except Room.DoesNotExist:
+            return Response({"error": "Room not found"}, status=404)
+
         # Delete room
         room.delete()
         return Response({"message": "Room deleted successfully"}, status=200)
@@ -361,7 +482,7 @@ def manage_room(request, room_id):
 # ROOM BOOKING (STUDENT / TEACHER)
 # =================================================
 @api_view(['POST'])
-@authentication_classes([JWTAuthentication])
+@authentication_classes([ProfileJWTAuthentication])
 @permission_classes([IsAuthenticated])
 def request_room(request):
 
@@ -379,7 +500,7 @@ def request_room(request):
         clash_exists = RoomBooking.objects.filter(
             room=room,
             booking_date=booking_date,
-            status="APPROVED",
+            status=RoomBooking.Status.APPROVED,
             start_time__lt=end_time,
             end_time__gt=start_time,
         ).exists()
@@ -404,7 +525,7 @@ def request_room(request):
                 booking_date=booking_date,
                 start_time=start_time,
                 end_time=end_time,
-                status="PENDING_COORDINATOR"
+                status=RoomBooking.Status.PENDING_COORDINATOR
             )
 
             return Response(
@@ -424,7 +545,7 @@ def request_room(request):
                 booking_date=booking_date,
                 start_time=start_time,
                 end_time=end_time,
-                status="PENDING_HOD"
+                status=RoomBooking.Status.PENDING_HOD
             )
 
             return Response(
@@ -449,38 +570,39 @@ def request_room(request):
 # Teacher: Leave Log (Read-only)
 # =================================================
 @api_view(['GET'])
-@authentication_classes([JWTAuthentication])
+@authentication_classes([ProfileJWTAuthentication])
 @permission_classes([IsAuthenticated])
 def leave_log(request):
 
-    user = request.user
-
     # ✅ ONLY BATCH COORDINATOR OR HOD
-    if (
-        user.role != 'teacher' or
-        not (
-            user.teacher_profile.is_batch_coordinator or
-            user.teacher_profile.is_hod
-        )
-    ):
+    if not (request.is_coordinator or request.is_hod):
         return Response(
             {"error": "Only Batch Coordinators or HOD can view leave log"},
             status=403
         )
 
     leaves = StudentLeave.objects.select_related(
-        'student__user',
-        'division'
+        'student__user'
+    ).only(
+        'from_date',
+        'to_date',
+        'status',
+        'coordinator_remark',
+        'decision_at',
+        'student__user__username',
+    ).annotate(
+        division_label=DIVISION_LABEL
     ).filter(
         status="APPROVED"   # ✅ Only approved leaves
     ).order_by('-decision_at')
 
     data = []
 
-    for l in leaves:
+    # Stream rows in chunks, the approved log only ever grows
+    for l in leaves.iterator(chunk_size=500):
         data.append({
             "student": l.student.user.username,
-            "division": f"{l.division.course} - Sem {l.division.semester} - {l.division.division}",
+            "division": l.division_label,
             "from": l.from_date,
             "to": l.to_date,
             "status": l.status,
@@ -494,209 +616,260 @@ def leave_log(request):
 # Room Booking Log (Approved only)
 # =================================================
 @api_view(['GET'])
-@authentication_classes([JWTAuthentication])
+@authentication_classes([ProfileJWTAuthentication])
 @permission_classes([IsAuthenticated])
+@etag(booking_etag)
 def room_booking_log(request):
 
-    bookings = RoomBooking.objects.select_related(
-        'room',
-        'requested_by',
-        'division'
-    ).filter(
-        status="APPROVED"
-    ).order_by('booking_date', 'start_time')
+    bookings = RoomBooking.objects.filter(
+        status=RoomBooking.Status.APPROVED
+    ).order_by('booking_date', 'start_time').values(
+        'room__room_number',
+        'room__room_type',
+        'booking_date',
+        'start_time',
+        'end_time',
+        'requested_by__username',
+        'requested_by__role',
+        division_label=DIVISION_LABEL,
+    )
 
-    data = []
+    def row(b):
+        return {
+            "room": b["room__room_number"],
+            "room_type": ROOM_TYPE_DISPLAY.get(b["room__room_type"], b["room__room_type"]),
+            "date": b["booking_date"],
+            "start_time": b["start_time"],
+            "end_time": b["end_time"],
+            "booked_by": b["requested_by__username"],
+            "role": b["requested_by__role"],
+            "division": b["division_label"],
+        }
 
-    for b in bookings:
-        data.append({
-            "room": b.room.room_number,
-            "room_type": b.room.get_room_type_display(),
-            "date": b.booking_date,
-            "start_time": b.start_time,
-            "end_time": b.end_time,
-            "booked_by": b.requested_by.username,
-            "role": b.requested_by.role,
-            "division": (
-                f"{b.division.course} - Sem {b.division.semester} - {b.division.division}"
-                if b.division else "N/A"
-            ),
-        })
+    if "page" in request.query_params:
+        return list_response(request, bookings, row)
 
-    return Response(data)
+    # Same body for every user, rebuilt only after a booking changes
+    # (no key without a shared cache backend)
+    key = booking_log_key()
+    content = cache.get(key) if key else None
+
+    if content is not None:
+        return HttpResponse(content, content_type="application/json")
+
+    def body():
+        parts = []
+        for part in stream_json_list(
+            row(b) for b in bookings.iterator(chunk_size=1000)
+        ):
+            if key:
+                parts.append(part)
+            yield part
+        if key:
+            cache.set(key, b"".join(parts), BOOKING_LOG_TIMEOUT)
+
+    return StreamingHttpResponse(body(), content_type="application/json")
 
 
 @api_view(['GET'])
-@authentication_classes([JWTAuthentication])
+@authentication_classes([ProfileJWTAuthentication])
 @permission_classes([IsAuthenticated])
+@require_coordinator
 def coordinator_requests(request):
 
-    user = request.user
-
-    if user.role != 'teacher' or not user.teacher_profile.is_batch_coordinator:
-        return Response({"error": "Unauthorized"}, status=403)
-
-    t = user.teacher_profile
+    course, semester, division = request.coordinator_triplet
 
     bookings = RoomBooking.objects.filter(
-        status="PENDING_COORDINATOR",
-        division__course=t.coordinator_course,
-        division__semester=t.coordinator_semester,
-        division__division=t.coordinator_division
-    )
-
-    data = [
-        {
+        status=RoomBooking.Status.PENDING_COORDINATOR,
+        division__course=course,
+        division__semester=semester,
+        division__division=division
+    ).select_related("room", "requested_by").only(
+        'id',
+        'purpose',
+        'booking_date',
+        'room__room_number',
+        'requested_by__username',
+    ).annotate(
+        time_label=TIME_LABEL
+    ).order_by('id')
+
+    def row(b):
+        return {
             "id": b.id,
             "room": b.room.room_number,
             "purpose": b.purpose,
             "date": b.booking_date,
-            "time": f"{b.start_time} - {b.end_time}",
+            "time": b.time_label,
             "requested_by": b.requested_by.username,
         }
-        for b in bookings
-    ]
 
-    return Response(data)
+    return list_response(request, bookings, row)
 
 
 @api_view(['POST'])
-@authentication_classes([JWTAuthentication])
+@authentication_classes([ProfileJWTAuthentication])
 @permission_classes([IsAuthenticated])
+@require_coordinator
 def coordinator_action(request, booking_id):
 
-    user = request.user
-
-    if user.role != 'teacher' or not user.teacher_profile.is_batch_coordinator:
-        return Response({"error": "Unauthorized"}, status=403)
-
     action = request.data.get("action")
 
-    try:
-        booking = RoomBooking.objects.get(id=booking_id)
+    if action == "approve":
+        fields = {
+            "status": RoomBooking.Status.PENDING_HOD,
+            "coordinator_approved": True,
+        }
+    elif action == "reject":
+        fields = {"status": RoomBooking.Status.REJECTED}
+    else:
+        return Response({"error": "Invalid action"}, status=400)
 
-        if action == "approve":
-            booking.status = "PENDING_HOD"
-            booking.coordinator_approved = True
-        elif action == "reject":
-            booking.status = "REJECTED"
-        else:
-            return Response({"error": "Invalid action"}, status=400)
+    if not RoomBooking.objects.filter(id=booking_id).update(**fields):
+        return Response({"error": "Booking not found"}, status=404)
 
-        booking.save()
-        return Response({"message": "Action completed"})
+    # update() skips the post_save signal
+    invalidate_bookings()
 
-    except RoomBooking.DoesNotExist:
-        return Response({"error": "Booking not found"}, status=404)
+    return Response({"message": "Action completed"})
 # =================================================
 # HOD: View Pending Room Requests
 # =================================================
 @api_view(['GET'])
-@authentication_classes([JWTAuthentication])
+@authentication_classes([ProfileJWTAuthentication])
 @permission_classes([IsAuthenticated])
+@require_hod
 def hod_requests(request):
 
-    user = request.user
-
-    if user.role != 'teacher' or not user.teacher_profile.is_hod:
-        return Response({"error": "Only HOD allowed"}, status=403)
-
-    hod_course = user.teacher_profile.hod_course
+    hod_course = request.hod_course
 
+    # student bookings of the HOD's course, plus teacher bookings (no division)
     bookings = RoomBooking.objects.filter(
-        status="PENDING_HOD"
-    ).select_related("room", "requested_by", "division")
-
-    data = []
-
-    for b in bookings:
-        # filter student bookings by HOD course
-        if b.division and b.division.course != hod_course:
-            continue
-
-        data.append({
+        Q(division__course=hod_course) | Q(division__isnull=True),
+        status=RoomBooking.Status.PENDING_HOD
+    ).select_related("room", "requested_by").only(
+        'id',
+        'purpose',
+        'booking_date',
+        'room__room_number',
+        'requested_by__username',
+        'requested_by__role',
+    ).annotate(
+        time_label=TIME_LABEL,
+        division_label=DIVISION_LABEL
+    ).order_by('id')
+
+    def row(b):
+        return {
             "id": b.id,
             "room": b.room.room_number,
             "purpose": b.purpose,
             "date": b.booking_date,
-            "time": f"{b.start_time} - {b.end_time}",
+            "time": b.time_label,
             "requested_by": b.requested_by.username,
             "role": b.requested_by.role,
-            "division": (
-                f"{b.division.course} - Sem {b.division.semester} - {b.division.division}"
-                if b.division else "N/A"
-            ),
-        })
+            "division": b.division_label,
+        }
 
-    return Response(data)
+    return list_response(request, bookings, row)
 # =================================================
 # HOD: Approve / Reject
 # =================================================
 @api_view(['POST'])
-@authentication_classes([JWTAuthentication])
+@authentication_classes([ProfileJWTAuthentication])
 @permission_classes([IsAuthenticated])
+@require_hod
 def hod_action(request, booking_id):
 
-    user = request.user
-
-    if user.role != 'teacher' or not user.teacher_profile.is_hod:
-        return Response({"error": "Only HOD allowed"}, status=403)
-
     action = request.data.get("action")
 
-    try:
-        booking = RoomBooking.objects.get(id=booking_id)
-
-        if action == "approve":
-            booking.status = "APPROVED"
-            booking.hod_approved = True
-        elif action == "reject":
-            booking.status = "REJECTED"
-        else:
-            return Response({"error": "Invalid action"}, status=400)
+    bookings = RoomBooking.objects.filter(id=booking_id)
+
+    if action == "approve":
+        # 🔴 CLASH GUARD: approve in one UPDATE only if no overlapping
+        # booking of the same room has been approved in the meantime
+        overlapping = RoomBooking.objects.filter(
+            room=OuterRef("room"),
+            booking_date=OuterRef("booking_date"),
+            status=RoomBooking.Status.APPROVED,
+            start_time__lt=OuterRef("end_time"),
+            end_time__gt=OuterRef("start_time"),
+        ).exclude(id=OuterRef("id"))
+
+        with transaction.atomic():
+            # Lock the booking's room so approvals for it run one at a
+            # time; under READ COMMITTED (PostgreSQL) two overlapping
+            # approvals would otherwise each pass the NOT EXISTS check
+            room_id = Room.objects.select_for_update(of=("self",)).filter(
+                roombooking__id=booking_id
+            ).values_list("pk", flat=True).first()
+
+            if room_id is None:
+                return Response({"error": "Booking not found"}, status=404)
+
+            approved = bookings.exclude(
+                Exists(overlapping)
+            ).update(status=RoomBooking.Status.APPROVED, hod_approved=True)
+
+        if not approved:
+            return Response(
+                {
+                    "error": "Room already booked for the selected date and time"
+                },
+                status=400
+            )
+    elif action == "reject":
+        if not bookings.update(status=RoomBooking.Status.REJECTED):
+            return Response({"error": "Booking not found"}, status=404)
+    else:
+        return Response({"error": "Invalid action"}, status=400)
 
-        booking.save()
-        return Response({"message": "Final decision recorded"})
+    # update() skips the post_save signal
+    invalidate_bookings()
 
-    except RoomBooking.DoesNotExist:
-        return Response({"error": "Booking not found"}, status=404)
+    return Response({"message": "Final decision recorded"})
 # =================================================
 # My Room Requests (Student / Teacher)
 # =================================================
 @api_view(['GET'])
-@authentication_classes([JWTAuthentication])
+@authentication_classes([ProfileJWTAuthentication])
 @permission_classes([IsAuthenticated])
+@etag(booking_etag)
 def my_room_requests(request):
 
     user = request.user
 
     bookings = RoomBooking.objects.filter(
         requested_by=user
-    ).select_related("room", "division")
-
-    data = []
+    ).order_by('id').values(
+        'id',
+        'room__room_number',
+        'room__room_type',
+        'purpose',
+        'booking_date',
+        'status',
+        time_label=TIME_LABEL,
+        division_label=DIVISION_LABEL,
+    )
 
-    for b in bookings:
-        data.append({
-            "id": b.id,
-            "room": b.room.room_number,
-            "room_type": b.room.get_room_type_display(),
-            "purpose": b.purpose,
-            "date": b.booking_date,
-            "time": f"{b.start_time} - {b.end_time}",
-            "status": b.status.replace("_", " "),
-            "division": (
-                f"{b.division.course} - Sem {b.division.semester} - {b.division.division}"
-                if b.division else "N/A"
-            ),
-        })
+    def row(b):
+        return {
+            "id": b["id"],
+            "room": b["room__room_number"],
+            "room_type": ROOM_TYPE_DISPLAY.get(b["room__room_type"], b["room__room_type"]),
+            "purpose": b["purpose"],
+            "date": b["booking_date"],
+            "time": b["time_label"],
+            "status": BOOKING_STATUS_NAMES[b["status"]],
+            "division": b["division_label"],
+        }
 
-    return Response(data)
+    return list_response(request, bookings, row)
 from .models import StudentLeave
 from django.utils.timezone import now
 
 @api_view(['POST'])
-@authentication_classes([JWTAuthentication])
+@authentication_classes([ProfileJWTAuthentication])
 @permission_classes([IsAuthenticated])
 @parser_classes([MultiPartParser, FormParser])
 def apply_leave(request):
@@ -720,8 +893,14 @@ def apply_leave(request):
             document=request.FILES.get("document"),
         )
 
-        leave.full_clean()
-        leave.save()
+        # student / division come from the authenticated profile, so skip
+        # the FK existence lookups (no unique fields or constraints either)
+        leave.full_clean(
+            exclude=['student', 'division'],
+            validate_unique=False,
+            validate_constraints=False,
+        )
+        leave.save(force_insert=True)
 
         return Response(
             {"message": "Leave request sent to Batch Coordinator"},
@@ -731,7 +910,7 @@ def apply_leave(request):
     except ValidationError as e:
         return Response({"error": e.message_dict}, status=400)
 @api_view(['GET'])
-@authentication_classes([JWTAuthentication])
+@authentication_classes([ProfileJWTAuthentication])
 @permission_classes([IsAuthenticated])
 def my_leaves(request):
 
@@ -740,10 +919,17 @@ def my_leaves(request):
 
     leaves = StudentLeave.objects.filter(
         student=request.user.student_profile
+    ).only(
+        'id',
+        'reason',
+        'from_date',
+        'to_date',
+        'status',
+        'coordinator_remark',
     ).order_by('-applied_at')
 
-    data = [
-        {
+    def row(l):
+        return {
             "id": l.id,
             "reason": l.reason,
             "from": l.from_date,
@@ -751,70 +937,72 @@ def my_leaves(request):
             "status": l.status,
             "remark": l.coordinator_remark,
         }
-        for l in leaves
-    ]
 
-    return Response(data)
+    return list_response(request, leaves, row)
 @api_view(['GET'])
-@authentication_classes([JWTAuthentication])
+@authentication_classes([ProfileJWTAuthentication])
 @permission_classes([IsAuthenticated])
+@require_coordinator
 def coordinator_leave_requests(request):
 
-    user = request.user
-
-    if user.role != 'teacher' or not user.teacher_profile.is_batch_coordinator:
-        return Response({"error": "Unauthorized"}, status=403)
-
-    t = user.teacher_profile
+    course, semester, division = request.coordinator_triplet
 
     leaves = StudentLeave.objects.filter(
         status='PENDING',
-        division__course=t.coordinator_course,
-        division__semester=t.coordinator_semester,
-        division__division=t.coordinator_division
+        division__course=course,
+        division__semester=semester,
+        division__division=division
+    ).order_by('id').values(
+        'id',
+        'student__user__username',
+        'reason',
+        'from_date',
+        'to_date',
+        'document',
     )
 
-    data = [
-        {
-            "id": l.id,
-            "student": l.student.user.username,
-            "reason": l.reason,
-            "from": l.from_date,
-            "to": l.to_date,
-            "document": l.document.url if l.document else None,
+    # Sign each stored document once, the raw name comes from values()
+    storage = StudentLeave._meta.get_field('document').storage
+    urls = {}
+
+    def document_url(name):
+        if name not in urls:
+            urls[name] = storage.url(name)
+        return urls[name]
+
+    def row(l):
+        return {
+            "id": l["id"],
+            "student": l["student__user__username"],
+            "reason": l["reason"],
+            "from": l["from_date"],
+            "to": l["to_date"],
+            "document": document_url(l["document"]) if l["document"] else None,
         }
-        for l in leaves
-    ]
 
-    return Response(data)
+    return list_response(request, leaves, row)
 @api_view(['POST'])
-@authentication_classes([JWTAuthentication])
+@authentication_classes([ProfileJWTAuthentication])
 @permission_classes([IsAuthenticated])
+@require_coordinator
 def coordinator_leave_action(request, leave_id):
 
-    user = request.user
-
-    if user.role != 'teacher' or not user.teacher_profile.is_batch_coordinator:
-        return Response({"error": "Unauthorized"}, status=403)
-
     action = request.data.get("action")
     remark = request.data.get("remark", "")
 
-    try:
-        leave = StudentLeave.objects.get(id=leave_id)
-
-        if action == "approve":
-            leave.status = "APPROVED"
-        elif action == "reject":
-            leave.status = "REJECTED"
-        else:
-            return Response({"error": "Invalid action"}, status=400)
-
-        leave.coordinator_remark = remark
-        leave.decision_at = now()
-        leave.save()
-
-        return Response({"message": "Leave decision recorded"})
-
-    except StudentLeave.DoesNotExist:
+    if action == "approve":
+        status = "APPROVED"
+    elif action == "reject":
+        status = "REJECTED"
+    else:
+        return Response({"error": "Invalid action"}, status=400)
+
+    updated = StudentLeave.objects.filter(id=leave_id).update(
+        status=status,
+        coordinator_remark=remark,
+        decision_at=now()
+    )
+    if not updated:
         return Response({"error": "Leave not found"}, status=404)
+
+    return Response({"message": "Leave decision recorded"})